@@ -0,0 +1,167 @@
+import argparse
+import importlib
+import json
+import re
+import statistics
+import sys
+import timeit
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Iterable
+
+import parse_cache
+
+ROOT = Path(__file__).parent
+DAY_RE = re.compile(r"^day(\d+)$")
+PART_RE = re.compile(r"^part_[12](_\w+)?$")
+
+DEFAULT_OUTPUT = ROOT / "bench.json"
+REGRESSION_THRESHOLD = 0.10  # relative slowdown of min latency
+
+
+def day_modules(
+    days: Iterable[int] | None = None,
+) -> Iterable[tuple[int, ModuleType | Exception]]:
+    # a day that fails to import (e.g. a missing solver dependency) is yielded
+    # with its exception instead of aborting the whole sweep
+    found = []
+    for path in ROOT.glob("day*/main.py"):
+        if match := DAY_RE.match(path.parent.name):
+            found.append(int(match[1]))
+
+    for day in sorted(found):
+        if days and day not in days:
+            continue
+        try:
+            module = importlib.import_module(f"day{day}.main")
+        except Exception as e:
+            yield day, e
+        else:
+            yield day, module
+
+
+def parts(module: ModuleType) -> Iterable[tuple[str, Callable[[str], object]]]:
+    for name, func in vars(module).items():
+        if PART_RE.match(name) and callable(func):
+            yield name, func
+
+
+def input_file(module: ModuleType, test: bool = False) -> Path:
+    if test:
+        return Path(module.__file__).parent / "test.txt"
+    return module.INPUT_FILE
+
+
+def measure(func: Callable[[str], object], s: str, repeat: int) -> list[float]:
+    timer = timeit.Timer(lambda: func(s))
+    number, _ = timer.autorange()  # doubles as warmup
+    return [t / number for t in timer.repeat(repeat=repeat, number=number)]
+
+
+def run(
+    days: Iterable[int] | None, repeat: int, test: bool, cached: bool = False
+) -> dict[str, dict]:
+    if not cached:
+        # every timed call would be a hit after the first, a cache that keeps
+        # nothing makes each one parse again
+        parse_cache.cache = parse_cache.ParseCache(max_bytes=0)
+    results = {}
+    for day, module in day_modules(days):
+        if isinstance(module, Exception):
+            print(f"day{day}: import failed, skipping: {module!r}", file=sys.stderr)
+            continue
+        path = input_file(module, test)
+        if not path.exists():
+            print(f"day{day}: no {path.name}, skipping", file=sys.stderr)
+            continue
+        s = path.read_text()
+        size = len(s.encode())
+
+        for name, func in parts(module):
+            key = f"day{day}.{name}"
+            print(f"{key}...", end=" ", flush=True, file=sys.stderr)
+            try:
+                times = measure(func, s, repeat)
+            except Exception as e:
+                # e.g. a part hard-coded for the real input fails on test.txt
+                results[key] = {"error": repr(e), "input_bytes": size}
+                print(f"failed: {e!r}", file=sys.stderr)
+                continue
+            best = min(times)
+            results[key] = {
+                "min": best,
+                "median": statistics.median(times),
+                "input_bytes": size,
+                "throughput_mb_s": size / best / 1e6 if best else None,
+            }
+            print(f"{best * 1e3:.3f}ms", file=sys.stderr)
+    return results
+
+
+def compare(
+    results: dict[str, dict], baseline: dict[str, dict], threshold: float
+) -> list[str]:
+    # a part that worked in the baseline but is missing or failing now is a
+    # regression too, otherwise a broken day would pass unnoticed
+    regressions = []
+    for key, old in baseline.items():
+        if "error" in old:
+            continue
+        if (new := results.get(key)) is None:
+            regressions.append(f"{key}: missing")
+            continue
+        if "error" in new:
+            regressions.append(f"{key}: failed with {new['error']}")
+            continue
+        ratio = new["min"] / old["min"]
+        if ratio > 1 + threshold:
+            regressions.append(f"{key}: {ratio:.2f}x slower")
+    return regressions
+
+
+def report(results: dict[str, dict]):
+    print(f"{'part':<32} {'min ms':>10} {'median ms':>10} {'bytes':>10} {'MB/s':>10}")
+    for key, r in results.items():
+        if "error" in r:
+            print(f"{key:<32} FAILED {r['error']}")
+            continue
+        throughput = r["throughput_mb_s"] or float("inf")
+        print(
+            f"{key:<32} {r['min'] * 1e3:>10.3f} {r['median'] * 1e3:>10.3f}"
+            f" {r['input_bytes']:>10} {throughput:>10.2f}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark every dayN part")
+    parser.add_argument("days", nargs="*", type=int, help="days to run, all if empty")
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("-t", "--test", action="store_true", help="use test.txt")
+    parser.add_argument("--cached", action="store_true", help="time parse cache hits")
+    parser.add_argument("-o", "--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("-b", "--baseline", type=Path)
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args()
+
+    results = run(args.days, args.repeat, args.test, args.cached)
+    report(results)
+    args.output.write_text(json.dumps(results, indent=4, sort_keys=True))
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if args.days:
+            baseline = {
+                key: old
+                for key, old in baseline.items()
+                if int(DAY_RE.match(key.split(".")[0])[1]) in args.days
+            }
+        if regressions := compare(results, baseline, args.threshold):
+            print("\nRegressions:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,28 +1,100 @@
 # --- Day 1: Calorie Counting ---
 
-import bisect
+import heapq
+import re
 from pathlib import Path
-from typing import Iterable
+from typing import IO, AnyStr, Iterable
+
+import numpy as np
 
 INPUT_FILE = Path(__file__).parent / "input.txt"
 
+CHUNK_SIZE = 2**16
+
 
 def get_elfs(s: str) -> Iterable[int]:
     for elf in s.split("\n\n"):
         yield sum(map(int, elf.splitlines()))
 
 
+def stream_elfs(file: IO[AnyStr], chunk_size: int = CHUNK_SIZE) -> Iterable[int]:
+    # works for text and binary files as well as mmaps, keeps a single line in memory
+    total, started = 0, False
+    tail = None
+    while chunk := file.read(chunk_size):
+        if tail is None:
+            tail = chunk[:0]
+            newline = "\n" if isinstance(chunk, str) else b"\n"
+        *lines, tail = (tail + chunk).split(newline)
+        for line in lines:
+            if line.strip():
+                total += int(line)
+                started = True
+            elif started:
+                yield total
+                total, started = 0, False
+    if tail and tail.strip():
+        total += int(tail)
+        started = True
+    if started:
+        yield total
+
+
+def top(elfs: Iterable[int], k: int) -> list[int]:
+    return heapq.nlargest(k, elfs)
+
+
+MAX_DIGITS = 18  # anything longer may not fit an int64
+POW10 = 10 ** np.arange(MAX_DIGITS, dtype=np.int64)
+LINE_PADDING = re.compile(rb"[ \t\r]*\n[ \t\r]*")
+
+
+def elf_totals(s: str) -> np.ndarray:
+    body = s.rstrip().encode()
+    if not body:
+        return np.zeros(0, dtype=np.int64)
+    # int() accepts whitespace around a number, e.g. from CRLF line endings
+    body = b"\n" + body.replace(b"\r\n", b"\n") + b"\n"
+    if b" " in body or b"\t" in body or b"\r" in body:
+        body = LINE_PADDING.sub(b"\n", body)
+    buf = np.frombuffer(body, dtype=np.uint8)
+    is_newline = buf == ord("\n")
+    if (((buf - ord("0")) > 9) & ~is_newline).any():
+        raise ValueError("Invalid calories, expected one number per line")
+    newlines = np.flatnonzero(is_newline)
+    ends = newlines[1:]
+    lengths = ends - newlines[:-1] - 1
+
+    # right-align every line in a (lines, width) digit matrix, blank lines are 0
+    width = lengths.max()
+    if width > MAX_DIGITS:
+        raise ValueError(f"Invalid calories, {width} digits is too large for int64")
+    offsets = np.arange(-width, 0)
+    digits = buf[ends[:, None] + offsets].astype(np.int64) - ord("0")
+    digits[offsets < -lengths[:, None]] = 0
+    values = digits @ POW10[width - 1 :: -1]
+
+    starts = np.flatnonzero(lengths == 0) + 1
+    return np.add.reduceat(values, np.concatenate(([0], starts)))
+
+
 def part_1(s: str) -> int:
     return max(get_elfs(s))
 
 
 def part_2(s: str) -> int:
-    top = 3
-    leaders = []
-    for elf in get_elfs(s):
-        bisect.insort_right(leaders, elf)
-        leaders = leaders[-top:]
-    return sum(leaders)
+    return sum(top(get_elfs(s), 3))
+
+
+def part_1_numpy(s: str) -> int:
+    return int(elf_totals(s).max())
+
+
+def part_2_numpy(s: str) -> int:
+    totals = elf_totals(s)
+    if totals.size <= 3:
+        return int(totals.sum())
+    return int(np.partition(totals, -3)[-3:].sum())
 
 
 if __name__ == "__main__":
@@ -1,8 +1,17 @@
+import io
 from pathlib import Path
 
 import pytest
 
-from .main import part_1, part_2
+from .main import (
+    elf_totals,
+    part_1,
+    part_1_numpy,
+    part_2,
+    part_2_numpy,
+    stream_elfs,
+    top,
+)
 
 TEST_INPUT_FILE = Path(__file__).parent / "test.txt"
 
@@ -14,7 +23,47 @@ def puzzle_input():
 
 def test_part_1(puzzle_input):
     assert part_1(puzzle_input) == 24000
+    assert part_1_numpy(puzzle_input) == 24000
 
 
 def test_part_2(puzzle_input):
     assert part_2(puzzle_input) == 45000
+    assert part_2_numpy(puzzle_input) == 45000
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 4096])
+def test_stream(puzzle_input, chunk_size):
+    expected = [6000, 4000, 11000, 24000, 10000]
+    text = io.StringIO(puzzle_input)
+    assert list(stream_elfs(text, chunk_size)) == expected
+    binary = io.BytesIO(puzzle_input.encode() + b"\n")
+    assert list(stream_elfs(binary, chunk_size)) == expected
+
+
+def test_top():
+    with TEST_INPUT_FILE.open("rb") as f:
+        assert top(stream_elfs(f), 2) == [24000, 11000]
+
+
+def test_elf_totals_input():
+    assert elf_totals("").size == 0
+    assert part_2_numpy("1\n\n2\n") == 3
+    assert elf_totals("9" * 18).tolist() == [10**18 - 1]
+    with pytest.raises(ValueError):
+        elf_totals("1" * 19)
+    with pytest.raises(ValueError):
+        elf_totals("10 00\n")
+    with pytest.raises(ValueError):
+        elf_totals("1000\nx\n")
+
+
+def test_elf_totals_whitespace(puzzle_input):
+    assert elf_totals(puzzle_input.replace("\n", "\r\n")).tolist() == [
+        6000,
+        4000,
+        11000,
+        24000,
+        10000,
+    ]
+    assert part_1_numpy("1000 \n 2000\t\n\n3000\r\n") == 3000
+    assert part_2_numpy("1000 \n 2000\t\n\n3000\r\n") == 6000
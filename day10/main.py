@@ -1,8 +1,12 @@
 # --- Day 10: Cathode-Ray Tube ---
 
+import warnings
+from array import array
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable, Self, Sequence
+
+import numpy as np
 
 INPUT_FILE = Path(__file__).parent / "input.txt"
 
@@ -42,6 +46,68 @@ class CPU:
                 raise ValueError(f"Invalid cmd {cmd} {args}")
 
 
+@dataclass(frozen=True)
+class Op:
+    cycles: int
+    has_arg: bool  # takes a single int operand, otherwise none
+    execute: Callable[[CPU, int], None]  # applied after the last cycle
+
+
+def _addx(cpu: CPU, val: int):
+    cpu.reg_x += val
+
+
+OPS: dict[str, Op] = {
+    "noop": Op(cycles=1, has_arg=False, execute=lambda cpu, _: None),
+    "addx": Op(cycles=2, has_arg=True, execute=_addx),
+}
+
+
+@dataclass
+class Program:
+    codes: array  # index into ops
+    args: array
+    ops: list[Op]
+
+    @classmethod
+    def decode(cls, s: str, ops: dict[str, Op] = OPS) -> Self:
+        index = {name: i for i, name in enumerate(ops)}
+        has_arg = [op.has_arg for op in ops.values()]
+        codes, args = array("B"), array("q")
+        for line in s.splitlines():
+            cmd, _, arg = line.partition(" ")
+            code = index.get(cmd)
+            if code is None or len(arg.split()) != has_arg[code]:
+                raise ValueError(f"Invalid cmd {line}")
+            try:
+                args.append(int(arg) if arg else 0)
+            except ValueError as e:
+                raise ValueError(f"Invalid cmd {line}") from e
+            codes.append(code)
+        return cls(codes, args, list(ops.values()))
+
+    def run(
+        self, cpu: CPU | None = None, observers: Sequence[Callable[[CPU], None]] = ()
+    ) -> CPU:
+        cpu = cpu or CPU()
+        ops = self.ops
+        if not observers:
+            for code, arg in zip(self.codes, self.args):
+                op = ops[code]
+                cpu.cycle += op.cycles
+                op.execute(cpu, arg)
+            return cpu
+
+        for code, arg in zip(self.codes, self.args):
+            op = ops[code]
+            for _ in range(op.cycles):
+                cpu.cycle += 1
+                for observe in observers:
+                    observe(cpu)
+            op.execute(cpu, arg)
+        return cpu
+
+
 def part_1(s: str) -> int:
     cpu = CPU()
     signal = 0
@@ -60,6 +126,56 @@ def part_2(s: str) -> str:
     return "".join(pixels)
 
 
+def part_1_vm(s: str) -> int:
+    signal = 0
+
+    def strength(cpu: CPU):
+        nonlocal signal
+        if (cpu.cycle + 20) % 40 == 0:
+            signal += cpu.cycle * cpu.reg_x
+
+    Program.decode(s).run(observers=[strength])
+    return signal
+
+
+def part_2_vm(s: str) -> str:
+    pixels = []
+    Program.decode(s).run(observers=[lambda cpu: pixels.append(cpu.draw())])
+    return "".join(pixels)
+
+
+def timeline(s: str) -> np.ndarray:
+    # every token takes one cycle: "noop" and "addx" change nothing during their
+    # cycle, and the argument of addx is its second cycle, after which x changes
+    noops, addxs = s.count("noop"), s.count("addx")
+    tokens = s.replace("noop", "0").replace("addx", "0")
+    lines = s.rstrip("\n").count("\n") + 1
+    try:
+        with warnings.catch_warnings():
+            # older numpy only warns on trailing garbage, the size check catches it
+            warnings.simplefilter("ignore", DeprecationWarning)
+            deltas = np.fromstring(tokens, dtype=np.int64, sep=" ")
+    except ValueError as e:
+        raise ValueError("Invalid program") from e
+    if deltas.size != noops + 2 * addxs or lines != noops + addxs:
+        raise ValueError("Invalid program")
+
+    # x during cycle i + 1
+    return 1 + np.concatenate(([0], np.cumsum(deltas[:-1])))
+
+
+def part_1_vectorized(s: str) -> int:
+    x = timeline(s)
+    cycles = np.arange(20, x.size + 1, 40)
+    return int((cycles * x[cycles - 1]).sum())
+
+
+def part_2_vectorized(s: str) -> str:
+    x = timeline(s)
+    lit = np.abs(x - np.arange(x.size) % 40) <= 1
+    return np.where(lit, ord("#"), ord(".")).astype(np.uint8).tobytes().decode()
+
+
 def crt(pixels: str) -> str:
     rows = ("".join(c) for c in chunks(pixels, 40))
     return "\n".join(rows)
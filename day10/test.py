@@ -2,7 +2,17 @@ from pathlib import Path
 
 import pytest
 
-from .main import part_1, part_2
+from .main import (
+    OPS,
+    Op,
+    Program,
+    part_1,
+    part_1_vectorized,
+    part_1_vm,
+    part_2,
+    part_2_vectorized,
+    part_2_vm,
+)
 
 TEST_INPUT_FILE = Path(__file__).parent / "test.txt"
 
@@ -14,6 +24,8 @@ def puzzle_input():
 
 def test_part_1(puzzle_input):
     assert part_1(puzzle_input) == 13140
+    assert part_1_vectorized(puzzle_input) == 13140
+    assert part_1_vm(puzzle_input) == 13140
 
 
 def test_part_2(puzzle_input):
@@ -25,3 +37,26 @@ def test_part_2(puzzle_input):
         "######......######......######......####"
         "#######.......#######.......#######....."
     )
+    assert part_2_vectorized(puzzle_input) == part_2(puzzle_input)
+    assert part_2_vm(puzzle_input) == part_2(puzzle_input)
+
+
+def test_custom_op():
+    def mulx(cpu, val):
+        cpu.reg_x *= val
+
+    ops = OPS | {"mulx": Op(cycles=3, has_arg=True, execute=mulx)}
+    program = Program.decode("addx 2\nmulx 5\nnoop", ops)
+    seen = []
+    cpu = program.run(observers=[lambda cpu: seen.append(cpu.reg_x)])
+    assert (cpu.reg_x, cpu.cycle) == (15, 6)
+    assert seen == [1, 1, 3, 3, 3, 15]
+    assert program.run().cycle == 6
+
+
+@pytest.mark.parametrize(
+    "s", ["addx", "noop 1", "addx 1 2", "addx x", "jmp 1", "noop\n\nnoop"]
+)
+def test_decode_invalid(s):
+    with pytest.raises(ValueError):
+        Program.decode(s)
@@ -2,10 +2,13 @@
 
 from dataclasses import dataclass
 from functools import reduce
+from math import isqrt, lcm
 from operator import mul
 from pathlib import Path
 from typing import Callable, Self
 
+import numpy as np
+
 INPUT_FILE = Path(__file__).parent / "input.txt"
 
 
@@ -18,6 +21,8 @@ class Monkey:
     index: int
     queue: list[int]
     op: Callable[[int], int]
+    operator: str  # "+" or "*"
+    operand: int | None  # None stands for old
     div: int
     target_true: int
     target_false: int
@@ -30,20 +35,22 @@ class Monkey:
 
         match lines[2].split()[-2:]:
             case "+", "old":
-                op = lambda old: old + old
+                op, operand = lambda old: old + old, None
             case "*", "old":
-                op = lambda old: old * old
+                op, operand = lambda old: old * old, None
             case "+", num if num := int(num):
-                op = lambda old: old + num
+                op, operand = lambda old: old + num, num
             case "*", num if num := int(num):
-                op = lambda old: old * num
+                op, operand = lambda old: old * num, num
             case unknwon_op:
                 raise ValueError(f"Unknown operation {unknwon_op}")
 
         return cls(
-            index=int(lines[0].split()[1][:1]),
+            index=int(lines[0].split()[1].rstrip(":")),
             queue=[int(i) for i in values[0].split(", ")],
             op=op,
+            operator=lines[2].split()[-2],
+            operand=operand,
             div=int(values[2].split()[-1]),
             target_true=int(values[3].split()[-1]),
             target_false=int(values[4].split()[-1]),
@@ -82,6 +89,205 @@ def part_2(s: str) -> int:
     return reduce(mul, annoyance[-2:])
 
 
+# residues below this can be multiplied in int64, and all fit a uint32
+MODULUS_MAX = isqrt(2**63 - 1)
+CHUNK_CELLS = 1 << 20  # worry residues handled per hop, bounds the temporaries
+
+
+def pack_moduli(divisors: list[int]) -> tuple[list[int], dict[int, int]]:
+    # worry only matters modulo the lcm of the divisors. When that is too large
+    # for int64 math it is split into several moduli, each the lcm of a group of
+    # divisors small enough to square. Returns them and every divisor's group
+    moduli, group = [], {}
+    for div in sorted(set(divisors)):
+        if div > MODULUS_MAX:
+            raise ValueError(f"Divisor {div} is too large for int64")
+        if not moduli or lcm(moduli[-1], div) > MODULUS_MAX:
+            moduli.append(1)
+        moduli[-1] = lcm(moduli[-1], div)
+        group[div] = len(moduli) - 1
+    return moduli, group
+
+
+def linear_op(m: Monkey) -> tuple[int, int]:
+    # factor and addend of the op, squaring is flagged separately
+    match m.operator, m.operand:
+        case "*", None:
+            return 1, 0
+        case "+", None:
+            return 2, 0
+        case "*", operand:
+            return operand, 0
+        case _, operand:
+            return 1, operand
+
+
+@dataclass
+class Troop:
+    # worry levels are kept as residues, one uint32 column per modulus. A troop
+    # whose divisors have a small enough lcm needs just one modulus, then worry
+    # and the op tables drop the column axis.
+    # every op is old * factor + addend (old + old doubles), except for squaring
+    square: np.ndarray
+    factor: np.ndarray
+    addend: np.ndarray
+    moduli: np.ndarray
+    column: np.ndarray  # column of every monkey's own divisor
+    div: np.ndarray
+    target_true: np.ndarray
+    target_false: np.ndarray
+
+    @classmethod
+    def from_monkeys(cls, monkeys: list[Monkey]) -> Self:
+        moduli, group = pack_moduli([m.div for m in monkeys])
+        shape = (-1, 1) if len(moduli) > 1 else (-1,)
+        moduli = np.array(moduli if len(moduli) > 1 else moduli[0], dtype=np.int64)
+        factor, addend = zip(*(linear_op(m) for m in monkeys))
+        square = [m.operator == "*" and m.operand is None for m in monkeys]
+        return cls(
+            square=np.array(square).reshape(shape),
+            factor=cls._table(factor, shape, moduli),
+            addend=cls._table(addend, shape, moduli),
+            moduli=moduli,
+            column=np.array([group[m.div] for m in monkeys]),
+            div=np.array([m.div for m in monkeys], dtype=np.int64),
+            target_true=np.array([m.target_true for m in monkeys]),
+            target_false=np.array([m.target_false for m in monkeys]),
+        )
+
+    @staticmethod
+    def _table(values: tuple[int, ...], shape: tuple, moduli: np.ndarray) -> np.ndarray:
+        values = np.array(values, dtype=np.int64).reshape(shape)
+        return (values % moduli).astype(np.uint32)
+
+    @property
+    def chunk_rows(self) -> int:
+        return max(1, CHUNK_CELLS // self.moduli.size)
+
+    def residues(self, worry: list[int]) -> np.ndarray:
+        worry = np.array(worry, dtype=np.int64)
+        residues = np.empty(worry.shape + self.moduli.shape, dtype=np.uint32)
+        for lo in range(0, worry.size, self.chunk_rows):
+            chunk = worry[lo : lo + self.chunk_rows]
+            residues[lo : lo + self.chunk_rows] = np.remainder.outer(chunk, self.moduli)
+        return residues
+
+    def throw(self, owner: np.ndarray, worry: np.ndarray, rounds: int) -> np.ndarray:
+        # instead of visiting every monkey in turn, every item still in play this
+        # round is inspected by its current owner at once. An item thrown to a
+        # later monkey stays in play, so a round is a few hops over the items and
+        # idle monkeys cost nothing. Hops go in chunks so temporaries stay bounded
+        annoyance = np.zeros(self.div.size, dtype=np.int64)
+        rows = self.chunk_rows
+        for _ in range(rounds):
+            active = np.arange(owner.size)
+            while active.size:
+                active = np.concatenate(
+                    [
+                        self._hop(owner, worry, active[lo : lo + rows], annoyance)
+                        for lo in range(0, active.size, rows)
+                    ]
+                )
+        return annoyance
+
+    def _hop(
+        self,
+        owner: np.ndarray,
+        worry: np.ndarray,
+        items: np.ndarray,
+        annoyance: np.ndarray,
+    ) -> np.ndarray:
+        # moves the given items on by one inspection, returns those still in play
+        held_by = owner[items]
+        annoyance += np.bincount(held_by, minlength=annoyance.size)
+
+        new = worry[items].astype(np.int64)
+        new *= np.where(self.square[held_by], new, self.factor[held_by])
+        new += self.addend[held_by]
+        new %= self.moduli
+        if new.ndim > 1:
+            own = new[np.arange(items.size), self.column[held_by]]
+        else:
+            own = new
+        target = np.where(
+            own % self.div[held_by] == 0,
+            self.target_true[held_by],
+            self.target_false[held_by],
+        )
+        worry[items], owner[items] = new, target
+        return items[target > held_by]
+
+
+def throw_vectorized(monkeys: list[Monkey], rounds: int) -> np.ndarray:
+    troop = Troop.from_monkeys(monkeys)
+    owner = np.array([i for i, m in enumerate(monkeys) for _ in m.queue])
+    worry = troop.residues([w for m in monkeys for w in m.queue])
+    return troop.throw(owner, worry, rounds)
+
+
+def part_2_vectorized(s: str) -> int:
+    annoyance = np.sort(throw_vectorized(parse(s), 10_000))
+    return int(annoyance[-2] * annoyance[-1])
+
+
+def item_rounds(
+    monkeys: list[Monkey], owner: int, worry: int, common: int, limit: int
+) -> tuple[list[list[int]], int | None]:
+    # follow one item round by round until its (owner, worry) state at the start of
+    # a round repeats, or for `limit` rounds if that comes first. Returns the
+    # monkeys inspecting it in every round seen and the round the loop starts at,
+    # None if it was cut off before repeating
+    seen: dict[tuple[int, int], int] = {}
+    history = []
+    while (owner, worry) not in seen:
+        if len(history) == limit:
+            return history, None
+        seen[owner, worry] = len(history)
+        inspected = []
+        while True:
+            inspected.append(owner)
+            m = monkeys[owner]
+            worry = m.op(worry) % common
+            target = m.get_target(worry)
+            # monkeys later in the order get the item again in this round
+            owner, done = target, target <= owner
+            if done:
+                break
+        history.append(inspected)
+    return history, seen[owner, worry]
+
+
+def annoyance_after(monkeys: list[Monkey], rounds: int, common: int) -> list[int]:
+    # each item costs min(rounds, time until its state repeats). A huge round count
+    # like 10**12 is only cheap when items loop quickly; with many divisors the
+    # state space and so the loops can be far longer than any feasible `rounds`
+    annoyance = [0] * len(monkeys)
+    for start, m in enumerate(monkeys):
+        for worry in m.queue:
+            history, loop_start = item_rounds(
+                monkeys, start, worry % common, common, rounds
+            )
+            if loop_start is not None:
+                loops, rest = divmod(
+                    max(rounds - loop_start, 0), len(history) - loop_start
+                )
+            for i, inspected in enumerate(history):
+                if loop_start is None or i < loop_start:
+                    times = 1
+                else:
+                    times = loops + (i - loop_start < rest)
+                for monkey in inspected:
+                    annoyance[monkey] += times
+    return annoyance
+
+
+def part_2_cycles(s: str) -> int:
+    monkeys = parse(s)
+    common = lcm(*(m.div for m in monkeys))
+    annoyance = sorted(annoyance_after(monkeys, 10_000, common))
+    return reduce(mul, annoyance[-2:])
+
+
 if __name__ == "__main__":
     s = INPUT_FILE.read_text()
     print(f"Part 1: {part_1(s)}")
@@ -1,8 +1,23 @@
+from functools import reduce
+from math import lcm, prod
+from operator import mul
 from pathlib import Path
 
 import pytest
+from pytest_mock import MockerFixture
 
-from .main import part_1, part_2
+from . import main
+from .main import (
+    Monkey,
+    Troop,
+    annoyance_after,
+    parse,
+    part_1,
+    part_2,
+    part_2_cycles,
+    part_2_vectorized,
+    throw_vectorized,
+)
 
 TEST_INPUT_FILE = Path(__file__).parent / "test.txt"
 
@@ -18,3 +33,78 @@ def test_part_1(puzzle_input):
 
 def test_part_2(puzzle_input):
     assert part_2(puzzle_input) == 2713310158
+    assert part_2_vectorized(puzzle_input) == 2713310158
+    assert part_2_cycles(puzzle_input) == 2713310158
+
+
+@pytest.mark.parametrize("rounds", [1, 20, 333])
+def test_annoyance_after(puzzle_input, rounds):
+    monkeys = parse(puzzle_input)
+    common = reduce(mul, (m.div for m in monkeys))
+    expected = throw_vectorized(monkeys, rounds).tolist()
+    assert annoyance_after(monkeys, rounds, common) == expected
+
+
+def test_monkey_index(puzzle_input):
+    raw = puzzle_input.split("\n\n")[0].replace("Monkey 0:", "Monkey 1234:")
+    assert Monkey.parse(raw).index == 1234
+
+
+def throw_lists(monkeys: list[Monkey], rounds: int, common: int) -> list[int]:
+    queues = [list(m.queue) for m in monkeys]
+    annoyance = [0] * len(monkeys)
+    for _ in range(rounds):
+        for i, m in enumerate(monkeys):
+            annoyance[i] += len(queues[i])
+            for old in queues[i]:
+                new = m.op(old) % common
+                queues[m.get_target(new)].append(new)
+            queues[i] = []
+    return annoyance
+
+
+@pytest.fixture
+def many_divisors():
+    # 40 distinct primes, their product is way past int64 and items practically
+    # never repeat a state
+    primes = [p for p in range(2, 200) if all(p % q for q in range(2, p))][:40]
+    raw = """Monkey {i}:
+  Starting items: {items}
+  Operation: new = old {op}
+  Test: divisible by {div}
+    If true: throw to monkey {a}
+    If false: throw to monkey {b}"""
+    ops = ["* old", "+ 7", "* 19", "+ old"]
+    s = "\n\n".join(
+        raw.format(
+            i=i,
+            items=", ".join(str(10 * i + j) for j in range(3)),
+            op=ops[i % 4],
+            div=div,
+            a=(i * 7 + 3) % 40,
+            b=(i * 11 + 5) % 40,
+        )
+        for i, div in enumerate(primes)
+    )
+    assert prod(primes) >= 2**63
+    return parse(s)
+
+
+def test_annoyance_after_long_loops(many_divisors):
+    common = lcm(*(m.div for m in many_divisors))
+    expected = throw_lists(many_divisors, 50, common)
+    assert annoyance_after(many_divisors, 50, common) == expected
+
+
+def test_many_divisors(many_divisors):
+    expected = throw_lists(many_divisors, 50, lcm(*(m.div for m in many_divisors)))
+    assert Troop.from_monkeys(many_divisors).moduli.size > 1
+    assert throw_vectorized(many_divisors, 50).tolist() == expected
+
+
+def test_throw_in_chunks(puzzle_input, mocker: MockerFixture):
+    mocker.patch.object(main, "CHUNK_CELLS", 3)
+    monkeys = parse(puzzle_input)
+    expected = throw_lists(monkeys, 20, lcm(*(m.div for m in monkeys)))
+    assert Troop.from_monkeys(monkeys).moduli.ndim == 0
+    assert throw_vectorized(monkeys, 20).tolist() == expected
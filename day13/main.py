@@ -1,62 +1,139 @@
 # --- Day 13: Distress Signal ---
 
+from bisect import bisect_right
 from functools import cmp_to_key
-from itertools import zip_longest
+from itertools import accumulate
 from pathlib import Path
+from typing import Iterable, Sequence
 
 from more_itertools import flatten
 
-INPUT_FILE = Path(__file__).parent / "input.txt"
+from parse_cache import cached_parse
 
+INPUT_FILE = Path(__file__).parent / "input.txt"
 
-def parse(s: str):
-    for pairs in s.split("\n\n"):
-        first, second = pairs.splitlines()
-        yield eval(first), eval(second)  # lol
-
-
-def compare(first, second) -> int:
-    for left, right in zip_longest(first, second):
-        match left, right:
-            case None, _:
-                return -1
-            case _, None:
-                return +1
-
-            case int(left), int(right):
-                if left < right:
-                    return -1
-                elif left > right:
-                    return +1
-
-            case list(left), list(right):
-                if (res := compare(left, right)) != 0:
-                    return res
-            case list(left), int(right):
-                if (res := compare(left, [right])) != 0:
-                    return res
-            case int(left), list(right):
-                if (res := compare([left], right)) != 0:
-                    return res
 
+# packets as flat token tuples, integers are never negative
+OPEN, CLOSE = -1, -2
+TOKENS = str.maketrans({"[": " -1 ", "]": " -2 ", ",": " "})
+
+Packet = tuple[int, ...]
+
+
+def tokenize(line: str) -> Packet:
+    return tuple(map(int, line.translate(TOKENS).split()))
+
+
+@cached_parse
+def parse(s: str) -> list[tuple[Packet, Packet]]:
+    pairs = []
+    for raw in s.split("\n\n"):
+        first, second = raw.splitlines()
+        pairs.append((tokenize(first), tokenize(second)))
+    return pairs
+
+
+def compare_tokens(first: Packet, second: Packet) -> int:
+    # an int compared against a list is wrapped as [int] on the fly: its tokens
+    # are pushed back as (int, CLOSE) once both sides consumed the OPEN
+    i, j = 0, 0
+    pushed_first: list[int] = []
+    pushed_second: list[int] = []
+    while i < len(first) or pushed_first:
+        left = pushed_first.pop() if pushed_first else first[(i := i + 1) - 1]
+        right = pushed_second.pop() if pushed_second else second[(j := j + 1) - 1]
+        if left == right:
+            continue
+        if left == CLOSE:
+            return -1
+        if right == CLOSE:
+            return +1
+        if left == OPEN:
+            pushed_second.extend((CLOSE, right))
+        elif right == OPEN:
+            pushed_first.extend((CLOSE, left))
+        else:
+            return -1 if left < right else +1
     return 0
 
 
+PacketKey = cmp_to_key(compare_tokens)
+
+# wrapping ints up to the deepest one blows each key up by ~ints * depth tokens,
+# past this the plain comparator is cheaper
+MAX_KEY_DEPTH = 32
+
+
+def count_less(packets: Iterable[Packet], packet: Packet) -> int:
+    return sum(compare_tokens(p, packet) == -1 for p in packets)
+
+
+def ranks(packets: Iterable[Packet], dividers: Sequence[Packet]) -> list[int]:
+    # 1-based positions the dividers would take in the sorted packets + dividers.
+    # A single pass: each packet finds its slot among the sorted dividers, it is
+    # less than every divider from that slot on
+    ordered = sorted(range(len(dividers)), key=lambda k: PacketKey(dividers[k]))
+    slots = [dividers[k] for k in ordered]
+    below = [0] * (len(dividers) + 1)
+    for packet in packets:
+        below[bisect_right(slots, PacketKey(packet), key=PacketKey)] += 1
+    less = {k: n for k, n in zip(ordered, accumulate(below))}
+    return [1 + less[k] + count_less(dividers, d) for k, d in enumerate(dividers)]
+
+
+def int_depth(packet: Packet) -> int:
+    depth = deepest = 0
+    for token in packet:
+        if token == OPEN:
+            depth += 1
+        elif token == CLOSE:
+            depth -= 1
+        else:
+            deepest = max(deepest, depth)
+    return deepest
+
+
+def sort_key(packet: Packet, depth: int) -> Packet:
+    # v compares like [v], so wrapping every int until it sits `depth` lists deep
+    # gives an equivalent packet where ints only ever meet ints. Such packets
+    # order exactly like their token tuples, because CLOSE < OPEN < any int
+    key = []
+    level = 0
+    for token in packet:
+        if token == OPEN:
+            level += 1
+            key.append(token)
+        elif token == CLOSE:
+            level -= 1
+            key.append(token)
+        else:
+            pad = depth - level
+            key.extend([OPEN] * pad)
+            key.append(token)
+            key.extend([CLOSE] * pad)
+    return tuple(key)
+
+
+def sort_packets(packets: list[Packet]) -> list[Packet]:
+    depth = max(map(int_depth, packets), default=0)
+    if depth > MAX_KEY_DEPTH:
+        return sorted(packets, key=PacketKey)
+    return sorted(packets, key=lambda p: sort_key(p, depth))
+
+
 def part_1(s: str) -> int:
-    correct = []
-    for i, (left, right) in enumerate(parse(s), start=1):
-        if compare(left, right) == -1:
-            correct.append(i)
-    return sum(correct)
+    pairs = parse(s)
+    return sum(
+        i
+        for i, (left, right) in enumerate(pairs, start=1)
+        if compare_tokens(left, right) == -1
+    )
 
 
 def part_2(s: str) -> int:
-    divs = [[2]], [[6]]
-    packets = list(flatten(parse(s)))
-    packets.extend(divs)
-
-    order = sorted(packets, key=cmp_to_key(compare))
-    return (order.index(divs[0]) + 1) * (order.index(divs[1]) + 1)
+    divs = tokenize("[[2]]"), tokenize("[[6]]")
+    first, second = ranks(flatten(parse(s)), divs)
+    return first * second
 
 
 if __name__ == "__main__":
@@ -1,8 +1,9 @@
+from functools import cmp_to_key
 from pathlib import Path
 
 import pytest
 
-from .main import part_1, part_2
+from .main import compare_tokens, parse, part_1, part_2, ranks, sort_packets, tokenize
 
 TEST_INPUT_FILE = Path(__file__).parent / "test.txt"
 
@@ -18,3 +19,26 @@ def test_part_1(puzzle_input):
 
 def test_part_2(puzzle_input):
     assert part_2(puzzle_input) == 140
+
+
+def test_compare_deep():
+    deep = tokenize("[" * 10_000 + "3" + "]" * 10_000)
+    assert compare_tokens(deep, tokenize("[4]")) == -1
+    assert compare_tokens(tokenize("[4]"), deep) == +1
+    assert compare_tokens(deep, tokenize("[3]")) == 0
+
+
+def test_ordering(puzzle_input):
+    packets = [p for pair in parse(puzzle_input) for p in pair]
+    divs = tokenize("[[2]]"), tokenize("[[6]]")
+    assert ranks(packets, divs) == [10, 14]
+
+    packets.extend(divs)
+    assert sort_packets(packets) == sorted(packets, key=cmp_to_key(compare_tokens))
+    assert ranks(packets[:-2], divs[::-1]) == [14, 10]
+
+
+def test_sort_deep(puzzle_input):
+    packets = [p for pair in parse(puzzle_input) for p in pair]
+    packets.append(tokenize("[" * 1_000 + "3" + "]" * 1_000))
+    assert sort_packets(packets) == sorted(packets, key=cmp_to_key(compare_tokens))
@@ -4,6 +4,8 @@ from itertools import starmap
 from pathlib import Path
 from typing import Iterable
 
+import numpy as np
+
 INPUT_FILE = Path(__file__).parent / "input.txt"
 
 # Rock     A X
@@ -47,16 +49,43 @@ def part_1(s: str) -> int:
 
 
 def part_2(s: str) -> int:
-    total = 0
-    for op, outcome in read_pairs(s):
-        match outcome:
-            case "A":  # loose
-                total += score(op, loose_table[op])
-            case "B":  # draw
-                total += score(op, op)
-            case "C":  # win
-                total += score(op, win_table[op])
-    return total
+    return sum(starmap(outcome_score, read_pairs(s)))
+
+
+def outcome_score(op: str, outcome: str) -> int:
+    match outcome:
+        case "A":  # loose
+            return score(op, loose_table[op])
+        case "B":  # draw
+            return score(op, op)
+        case "C":  # win
+            return score(op, win_table[op])
+        case _:
+            raise ValueError(f"Invalid outcome {outcome}")
+
+
+# only 9 distinct lines exist, indexed by 3 * op + yours
+SCORES_1 = np.array([score(op, yours) for op in "ABC" for yours in "ABC"])
+SCORES_2 = np.array([outcome_score(op, outcome) for op in "ABC" for outcome in "ABC"])
+
+
+def tally(data: bytes) -> np.ndarray:
+    raw = np.frombuffer(data.rstrip(b"\n") + b"\n", dtype=np.uint8).reshape(-1, 4)
+    index = (raw[:, 0] - ord("A")) * 3 + (raw[:, 2] - ord("X"))
+    return np.bincount(index, minlength=9)
+
+
+def scores(data: bytes) -> tuple[int, int]:
+    counts = tally(data)
+    return int(counts @ SCORES_1), int(counts @ SCORES_2)
+
+
+def part_1_counted(s: str) -> int:
+    return scores(s.encode())[0]
+
+
+def part_2_counted(s: str) -> int:
+    return scores(s.encode())[1]
 
 
 if __name__ == "__main__":
@@ -2,7 +2,7 @@ from pathlib import Path
 
 import pytest
 
-from .main import part_1, part_2
+from .main import outcome_score, part_1, part_1_counted, part_2, part_2_counted
 
 TEST_INPUT_FILE = Path(__file__).parent / "test.txt"
 
@@ -14,7 +14,14 @@ def puzzle_input():
 
 def test_part_1(puzzle_input):
     assert part_1(puzzle_input) == 15
+    assert part_1_counted(puzzle_input) == 15
 
 
 def test_part_2(puzzle_input):
     assert part_2(puzzle_input) == 12
+    assert part_2_counted(puzzle_input) == 12
+
+
+def test_invalid_outcome():
+    with pytest.raises(ValueError):
+        outcome_score("A", "D")
@@ -6,6 +6,8 @@ from itertools import count
 from pathlib import Path
 from typing import Self
 
+from parse_cache import cached_parse
+
 INPUT_FILE = Path(__file__).parent / "input.txt"
 
 
@@ -59,6 +61,7 @@ class Game:
         self.move_queue = deque((Dir.N, Dir.S, Dir.W, Dir.E))
 
     @classmethod
+    @cached_parse
     def parse(cls, s: str) -> Self:
         elfs = {}
         for y, line in enumerate(s.splitlines()):
@@ -9,6 +9,8 @@ from typing import Self
 import networkx as nx
 from more_itertools import flatten
 
+from parse_cache import cached_parse
+
 INPUT_FILE = Path(__file__).parent / "input.txt"
 
 
@@ -70,6 +72,7 @@ class Valley:
     tick: int
 
     @classmethod
+    @cached_parse
     def parse(cls, s: str) -> Self:
         lines = s.splitlines()
 
@@ -1,8 +1,11 @@
 # --- Day 3: Rucksack Reorganization ---
 
 from pathlib import Path
+from string import ascii_letters
 from typing import Iterable
 
+import numpy as np
+
 INPUT_FILE = Path(__file__).parent / "input.txt"
 
 
@@ -33,6 +36,45 @@ def part_2(s: str) -> int:
     return total
 
 
+# item with priority p is bit p, so a sack is a 53 bit mask
+BIT_LUT = np.zeros(256, dtype=np.uint64)
+for c in ascii_letters:
+    BIT_LUT[ord(c)] = 1 << letter_score(c)
+
+
+def _bits(s: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    buf = np.frombuffer(s.rstrip("\n").encode() + b"\n", dtype=np.uint8)
+    ends = np.flatnonzero(buf == ord("\n"))
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    return BIT_LUT[buf], starts, ends
+
+
+def _priorities(masks: np.ndarray) -> np.ndarray:
+    # masks have a single bit set, frexp gives its position without rounding issues
+    if ((masks == 0) | ((masks & (masks - 1)) != 0)).any():
+        raise ValueError("Expected exactly one common item per sack or group")
+    return np.frexp(masks.astype(np.float64))[1] - 1
+
+
+def part_1_numpy(s: str) -> int:
+    bits, starts, ends = _bits(s)
+    middles = starts + (ends - starts) // 2
+    bounds = np.column_stack((starts, middles)).ravel()
+    halves = np.bitwise_or.reduceat(bits, bounds).reshape(-1, 2)
+    return int(_priorities(halves[:, 0] & halves[:, 1]).sum())
+
+
+def badges(s: str, size: int) -> int:
+    bits, starts, _ = _bits(s)
+    sacks = np.bitwise_or.reduceat(bits, starts)
+    common = np.bitwise_and.reduce(sacks.reshape(-1, size), axis=1)
+    return int(_priorities(common).sum())
+
+
+def part_2_numpy(s: str) -> int:
+    return badges(s, size=3)
+
+
 if __name__ == "__main__":
     s = INPUT_FILE.read_text()
     print(f"Part 1: {part_1(s)}")
@@ -2,7 +2,7 @@ from pathlib import Path
 
 import pytest
 
-from .main import part_1, part_2
+from .main import badges, part_1, part_1_numpy, part_2, part_2_numpy
 
 TEST_INPUT_FILE = Path(__file__).parent / "test.txt"
 
@@ -14,7 +14,24 @@ def puzzle_input():
 
 def test_part_1(puzzle_input):
     assert part_1(puzzle_input) == 157
+    assert part_1_numpy(puzzle_input) == 157
 
 
 def test_part_2(puzzle_input):
     assert part_2(puzzle_input) == 70
+    assert part_2_numpy(puzzle_input) == 70
+
+
+def test_badges(puzzle_input):
+    assert badges(puzzle_input, size=3) == 70
+    with pytest.raises(ValueError):
+        badges(puzzle_input, size=4)
+
+
+def test_no_common_item():
+    with pytest.raises(ValueError):
+        part_1_numpy("abcd\n")
+    with pytest.raises(ValueError):
+        badges("ab\ncd\nef\n", size=3)
+    with pytest.raises(ValueError):
+        part_1_numpy("abab\n")
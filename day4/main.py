@@ -3,6 +3,8 @@
 from pathlib import Path
 from typing import Iterator
 
+import numpy as np
+
 INPUT_FILE = Path(__file__).parent / "input.txt"
 
 
@@ -43,6 +45,34 @@ def part_2(s: str) -> int:
     return total
 
 
+def parse_array(s: str) -> np.ndarray:
+    buf = np.frombuffer(b"," + s.encode() + b",", dtype=np.uint8)
+    is_digit = (buf >= ord("0")) & (buf <= ord("9"))
+    # numbers alternate rising and falling edges of is_digit
+    edges = np.flatnonzero(np.diff(is_digit.view(np.int8))) + 1
+    starts, ends = edges[::2], edges[1::2]
+    lengths = ends - starts
+
+    # horner over digit columns aligned to the end of each number
+    values = np.zeros(ends.size, dtype=np.int64)
+    for k in range(lengths.max(), 0, -1):
+        digit = buf[ends - k] - ord("0")
+        values = values * 10 + np.where(lengths >= k, digit, 0)
+    return values.reshape(-1, 4)
+
+
+def part_1_numpy(s: str) -> int:
+    a_start, a_end, b_start, b_end = parse_array(s).T
+    a_in_b = (b_start <= a_start) & (a_end <= b_end)
+    b_in_a = (a_start <= b_start) & (b_end <= a_end)
+    return int((a_in_b | b_in_a).sum())
+
+
+def part_2_numpy(s: str) -> int:
+    a_start, a_end, b_start, b_end = parse_array(s).T
+    return int(((a_start <= b_end) & (b_start <= a_end)).sum())
+
+
 if __name__ == "__main__":
     s = INPUT_FILE.read_text()
     print(f"Part 1: {part_1(s)}")
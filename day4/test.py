@@ -2,7 +2,7 @@ from pathlib import Path
 
 import pytest
 
-from .main import part_1, part_2
+from .main import part_1, part_1_numpy, part_2, part_2_numpy
 
 TEST_INPUT_FILE = Path(__file__).parent / "test.txt"
 
@@ -14,7 +14,9 @@ def puzzle_input():
 
 def test_part_1(puzzle_input):
     assert part_1(puzzle_input) == 2
+    assert part_1_numpy(puzzle_input) == 2
 
 
 def test_part_2(puzzle_input):
     assert part_2(puzzle_input) == 4
+    assert part_2_numpy(puzzle_input) == 4
@@ -16,10 +16,10 @@ def parse(s: str) -> tuple[list[list[str]], Iterable[tuple[int, int, int]]]:
 def parse_stacks(lines: Sequence[str]) -> list[list[str]]:
     stacks_num = (len(lines[0]) + 1) // 4
     stacks = [[] for _ in range(stacks_num)]
-    for line in lines:
+    for line in reversed(lines):
         for i, crate in enumerate(line[1::4]):
             if crate != " ":
-                stacks[i].insert(0, crate)
+                stacks[i].append(crate)
     return stacks
 
 
@@ -30,20 +30,30 @@ def parse_instructions(lines: Iterable[str]) -> Iterable[tuple[int, int, int]]:
         yield count, src, dst
 
 
-def part_1(s: str) -> str:
+def move(stacks: list[list[str]], count: int, src: int, dst: int, reverse: bool):
+    # slicing and deleting the top block touches only `count` crates
+    if not count:
+        return  # [-0:] would be the whole stack
+    block = stacks[src][-count:]
+    del stacks[src][-count:]
+    if reverse:
+        block.reverse()
+    stacks[dst].extend(block)
+
+
+def run(s: str, reverse: bool) -> str:
     stacks, instructions = parse(s)
     for count, src, dst in instructions:
-        for _ in range(count):
-            stacks[dst].append(stacks[src].pop())
+        move(stacks, count, src, dst, reverse)
     return "".join(s[-1] for s in stacks)
 
 
+def part_1(s: str) -> str:
+    return run(s, reverse=True)
+
+
 def part_2(s: str) -> str:
-    stacks, instructions = parse(s)
-    for count, src, dst in instructions:
-        stacks[dst].extend(stacks[src][-count:])
-        stacks[src] = stacks[src][:-count]
-    return "".join(s[-1] for s in stacks)
+    return run(s, reverse=False)
 
 
 if __name__ == "__main__":
@@ -2,7 +2,7 @@ from pathlib import Path
 
 import pytest
 
-from .main import part_1, part_2
+from .main import move, part_1, part_2
 
 TEST_INPUT_FILE = Path(__file__).parent / "test.txt"
 
@@ -18,3 +18,9 @@ def test_part_1(puzzle_input):
 
 def test_part_2(puzzle_input):
     assert part_2(puzzle_input) == "MCD"
+
+
+def test_move_zero():
+    stacks = [["1", "Z", "N"], ["2", "M"]]
+    move(stacks, 0, 0, 1, reverse=True)
+    assert stacks == [["1", "Z", "N"], ["2", "M"]]
@@ -1,10 +1,13 @@
 # --- Day 6: Tuning Trouble ---
 
-import timeit
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import IO, Iterable
 
 INPUT_FILE = Path(__file__).parent / "input.txt"
 
+CHUNK_SIZE = 2**16
+
 
 def find_marker(s: str, size: int) -> int:
     candidates = ((i + size, s[i : i + size]) for i in range(len(s) - size))
@@ -29,6 +32,44 @@ def find_marker_optimized(s: str, size: int) -> int:
         beg = beg + missing
 
 
+@dataclass
+class MarkerDetector:
+    size: int
+    pos: int = 0
+    start: int = 0  # first position of the current run without repeats
+    last_seen: list[int] = field(default_factory=lambda: [-1] * 256)
+
+    def feed(self, chunk: bytes) -> list[int]:
+        # the whole chunk is consumed before returning, so the detector state is
+        # always at the end of the chunk whatever the caller does with the markers
+        size, start, last_seen = self.size, self.start, self.last_seen
+        markers = []
+        for pos, c in enumerate(chunk, start=self.pos):
+            if last_seen[c] >= start:
+                start = last_seen[c] + 1
+            last_seen[c] = pos
+            if pos - start + 1 >= size:
+                markers.append(pos + 1)
+        self.pos += len(chunk)
+        self.start = start
+        return markers
+
+
+def stream_markers(
+    file: IO[bytes], size: int, chunk_size: int = CHUNK_SIZE
+) -> Iterable[int]:
+    detector = MarkerDetector(size)
+    while chunk := file.read(chunk_size):
+        yield from detector.feed(chunk)
+
+
+def find_marker_streaming(s: str, size: int, chunk_size: int = CHUNK_SIZE) -> int:
+    data, detector = s.encode(), MarkerDetector(size)
+    for beg in range(0, len(data), chunk_size):
+        if markers := detector.feed(data[beg : beg + chunk_size]):
+            return markers[0]
+
+
 def part_1(s: str) -> int:
     return find_marker(s, 4)
 
@@ -37,6 +78,10 @@ def part_1_optimized(s: str) -> int:
     return find_marker_optimized(s, 4)
 
 
+def part_1_streaming(s: str) -> int:
+    return find_marker_streaming(s, 4)
+
+
 def part_2(s: str) -> int:
     return find_marker(s, 14)
 
@@ -45,18 +90,11 @@ def part_2_optimized(s: str) -> int:
     return find_marker_optimized(s, 14)
 
 
-def bench(s: str):
-    print("Bench")
-    p1 = timeit.timeit(lambda: part_1(s), number=10000)
-    p1_opt = timeit.timeit(lambda: part_1_optimized(s), number=10000)
-    print(f"  Part 1: {p1 / p1_opt:.2f}x")
-    p2 = timeit.timeit(lambda: part_2(s), number=10000)
-    p2_opt = timeit.timeit(lambda: part_2_optimized(s), number=10000)
-    print(f"  Part 2: {p2 / p2_opt:.2f}x")
+def part_2_streaming(s: str) -> int:
+    return find_marker_streaming(s, 14)
 
 
 if __name__ == "__main__":
     s = INPUT_FILE.read_text()
     print(f"Part 1: {part_1_optimized(s)}")
     print(f"Part 2: {part_2_optimized(s)}")
-    bench(s)
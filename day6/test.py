@@ -1,8 +1,18 @@
+import io
 from pathlib import Path
 
 import pytest
 
-from .main import part_1, part_1_optimized, part_2, part_2_optimized
+from .main import (
+    MarkerDetector,
+    part_1,
+    part_1_optimized,
+    part_1_streaming,
+    part_2,
+    part_2_optimized,
+    part_2_streaming,
+    stream_markers,
+)
 
 TEST_INPUT_FILE = Path(__file__).parent / "test.txt"
 
@@ -15,8 +25,29 @@ def puzzle_input():
 def test_part_1(puzzle_input):
     assert part_1(puzzle_input) == 7
     assert part_1_optimized(puzzle_input) == 7
+    assert part_1_streaming(puzzle_input) == 7
 
 
 def test_part_2(puzzle_input):
     assert part_2(puzzle_input) == 19
     assert part_2_optimized(puzzle_input) == 19
+    assert part_2_streaming(puzzle_input) == 19
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 4096])
+def test_stream_markers(puzzle_input, chunk_size):
+    data = puzzle_input.encode()
+    expected = MarkerDetector(4).feed(data)
+    assert expected[0] == 7
+    assert list(stream_markers(io.BytesIO(data), 4, chunk_size)) == expected
+    assert next(stream_markers(io.BytesIO(data), 14, chunk_size)) == 19
+
+
+def test_all_markers():
+    assert MarkerDetector(3).feed(b"aabcdd") == [4, 5]
+
+
+def test_feed_after_first_marker():
+    detector = MarkerDetector(4)
+    assert detector.feed(b"abcd")[0] == 4
+    assert detector.feed(b"efgh") == [5, 6, 7, 8]
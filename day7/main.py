@@ -1,12 +1,20 @@
 # --- Day 7: No Space Left On Device ---
 
+from array import array
 from dataclasses import dataclass, field
 from functools import cached_property
 from pathlib import Path
 from typing import Iterable, Self
 
+import numpy as np
+
+from parse_cache import cached_parse
+
 INPUT_FILE = Path(__file__).parent / "input.txt"
 
+MEM_MAX = 70000000
+UPDATE_SIZE = 30000000
+
 
 @dataclass
 class Dir:
@@ -26,6 +34,7 @@ class Dir:
         yield self
 
 
+@cached_parse
 def parse_fs(s: str) -> Dir:
     root = Dir(name="/", parent=None)  # type: ignore
     pwd = root
@@ -59,6 +68,141 @@ def parse_fs(s: str) -> Dir:
     return root
 
 
+@dataclass
+class SizeIndex:
+    sizes: np.ndarray  # ascending
+    prefix: np.ndarray  # prefix[i] == sizes[:i].sum()
+
+    @classmethod
+    def build(cls, sizes: np.ndarray) -> Self:
+        sizes = np.sort(sizes)
+        return cls(sizes, np.concatenate(([0], np.cumsum(sizes))))
+
+    def smallest_above(self, limit: int) -> int | None:
+        i = np.searchsorted(self.sizes, limit, side="right")
+        return int(self.sizes[i]) if i < self.sizes.size else None
+
+    def total_below(self, limit: int) -> int:
+        return int(self.prefix[np.searchsorted(self.sizes, limit, side="left")])
+
+    def largest(self, k: int) -> list[int]:
+        return self.sizes[::-1][:k].tolist()
+
+
+@dataclass
+class FileTree:
+    # directory i is described by entry i of every array, the root is 0
+    parent: np.ndarray
+    depth: np.ndarray
+    files: np.ndarray  # size of files directly inside
+    size: np.ndarray = field(init=False)
+
+    def __post_init__(self):
+        # children are always deeper than their parents, so summing one depth level
+        # at a time from the bottom up gives totals without any recursion
+        self.size = self.files.copy()
+        order = np.argsort(self.depth, kind="stable")
+        levels = np.searchsorted(self.depth[order], np.arange(self.depth.max() + 2))
+        for lo, hi in reversed(list(zip(levels[1:-1], levels[2:]))):
+            nodes = order[lo:hi]
+            np.add.at(self.size, self.parent[nodes], self.size[nodes])
+
+    @cached_property
+    def index(self) -> SizeIndex:
+        return SizeIndex.build(self.size)
+
+
+class LogParser:
+    # consumes a terminal log line by line, with track_totals every directory total
+    # is kept up to date as ls output arrives so queries work mid-stream
+    def __init__(self, track_totals: bool = True):
+        self.track_totals = track_totals
+        self.parent, self.depth = array("q", [0]), array("q", [0])
+        self.files, self.totals = array("q", [0]), array("q", [0])
+        self.pwd = 0
+        # names are interned to ids and a subdirectory is keyed by one int packing
+        # its parent and its name id, so there is no tuple or string per entry.
+        # ls always prints the same files for a directory, so instead of a lookup
+        # per file only its first listing is counted
+        self._names: dict[str, int] = {}
+        self._children: dict[int, int] = {}
+        self._listed = bytearray(1)
+        self._listing = True
+
+    def feed(self, line: str):
+        match line.split():
+            case "$", "cd", "/":
+                self.pwd = 0
+            case "$", "cd", "..":
+                self.pwd = self.parent[self.pwd]
+            case "$", "cd", name:
+                self.pwd = self._subdir(name)
+            case "$", "ls":
+                self._listing = not self._listed[self.pwd]
+                self._listed[self.pwd] = True
+            case "$", *cmd:
+                raise ValueError(f"Unknown command {cmd}")
+            case "dir", name:
+                self._subdir(name)
+            case size, _ if self._listing:
+                self._add_file(int(size))
+
+    def feed_lines(self, lines: Iterable[str]) -> Self:
+        for line in lines:
+            self.feed(line)
+        return self
+
+    def _subdir(self, name: str) -> int:
+        name_id = self._names.setdefault(name, len(self._names))
+        if (key := name_id << 32 | self.pwd) not in self._children:
+            self._children[key] = len(self.parent)
+            self.parent.append(self.pwd)
+            self.depth.append(self.depth[self.pwd] + 1)
+            self.files.append(0)
+            self.totals.append(0)
+            self._listed.append(False)
+        return self._children[key]
+
+    def _add_file(self, size: int):
+        self.files[self.pwd] += size
+        if not self.track_totals:
+            return
+        node = self.pwd
+        while True:
+            self.totals[node] += size
+            if node == 0:
+                break
+            node = self.parent[node]
+
+    def total_under(self, limit: int) -> int:
+        return sum(t for t in self.totals if t < limit)
+
+    def smallest_to_free(self, disk: int = MEM_MAX, needed: int = UPDATE_SIZE) -> int:
+        to_free = needed - (disk - self.totals[0])
+        return min(t for t in self.totals if t > to_free)
+
+    def tree(self) -> FileTree:
+        return FileTree(
+            parent=np.array(self.parent, dtype=np.int64),
+            depth=np.array(self.depth, dtype=np.int64),
+            files=np.array(self.files, dtype=np.int64),
+        )
+
+
+def iter_lines(s: str) -> Iterable[str]:
+    # one line at a time, splitlines would hold a string for every line at once
+    start = 0
+    while (end := s.find("\n", start)) != -1:
+        yield s[start:end]
+        start = end + 1
+    if start < len(s):
+        yield s[start:]
+
+
+def parse_tree(s: str) -> FileTree:
+    return LogParser(track_totals=False).feed_lines(iter_lines(s)).tree()
+
+
 def part_1(s: str) -> int:
     root = parse_fs(s)
     score = 0
@@ -69,9 +213,6 @@ def part_1(s: str) -> int:
 
 
 def part_2(s: str) -> int:
-    MEM_MAX = 70000000
-    UPDATE_SIZE = 30000000
-
     root = parse_fs(s)
     free = MEM_MAX - root.size
     to_free = UPDATE_SIZE - free
@@ -80,6 +221,16 @@ def part_2(s: str) -> int:
     return next(c for c in candidates if c > to_free)
 
 
+def part_1_compact(s: str) -> int:
+    return parse_tree(s).index.total_below(100_000)
+
+
+def part_2_compact(s: str) -> int:
+    tree = parse_tree(s)
+    to_free = UPDATE_SIZE - (MEM_MAX - tree.size[0])
+    return tree.index.smallest_above(to_free)
+
+
 if __name__ == "__main__":
     s = INPUT_FILE.read_text()
     print(f"Part 1: {part_1(s)}")
@@ -2,7 +2,7 @@ from pathlib import Path
 
 import pytest
 
-from .main import part_1, part_2
+from .main import LogParser, parse_tree, part_1, part_1_compact, part_2, part_2_compact
 
 TEST_INPUT_FILE = Path(__file__).parent / "test.txt"
 
@@ -14,7 +14,34 @@ def puzzle_input():
 
 def test_part_1(puzzle_input):
     assert part_1(puzzle_input) == 95437
+    assert part_1_compact(puzzle_input) == 95437
 
 
 def test_part_2(puzzle_input):
     assert part_2(puzzle_input) == 24933642
+    assert part_2_compact(puzzle_input) == 24933642
+
+
+def test_log_parser():
+    parser = LogParser()
+    with TEST_INPUT_FILE.open() as log:
+        for line in log:
+            parser.feed(line)
+            if line.startswith("584 i"):
+                assert parser.total_under(100_000) == 584 + 94853
+    assert parser.total_under(100_000) == 95437
+    assert parser.smallest_to_free() == 24933642
+
+
+def test_log_parser_relisted(puzzle_input):
+    again = "$ cd /\n$ cd a\n$ ls\ndir e\n29116 f\n2557 g\n62596 h.lst\n"
+    parser = LogParser().feed_lines((puzzle_input + "\n" + again).splitlines())
+    assert parser.total_under(100_000) == 95437
+
+
+def test_size_index(puzzle_input):
+    index = parse_tree(puzzle_input).index
+    assert index.total_below(100_000) == 95437
+    assert index.smallest_above(8381165) == 24933642
+    assert index.smallest_above(48381165) is None
+    assert index.largest(2) == [48381165, 24933642]
@@ -1,62 +1,260 @@
 # --- Day 8: Treetop Tree House ---
 
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import accumulate
 from pathlib import Path
 
 import numpy as np
 
 INPUT_FILE = Path(__file__).parent / "input.txt"
 
+MEMORY_BUDGET = 2**30  # bytes the out-of-core solver may use, over all workers
+CELL_BYTES = 16  # peak bytes a worker holds per cell of its strip, measured
 
-def parse(s: str) -> list[list[int]]:
-    return [list(map(int, l)) for l in s.splitlines()]
+
+def parse(s: str) -> np.ndarray:
+    width = s.find("\n") if "\n" in s else len(s)
+    buf = np.frombuffer(s.rstrip("\n").encode() + b"\n", dtype=np.uint8)
+    if buf.size % (width + 1):
+        raise ValueError(f"Invalid grid, rows are not all {width} wide")
+    lines = buf.reshape(-1, width + 1)
+    if (lines[:, width] != ord("\n")).any():
+        raise ValueError(f"Invalid grid, rows are not all {width} wide")
+    return digits(lines[:, :width])
+
+
+def digits(chars: np.ndarray) -> np.ndarray:
+    grid = chars - ord("0")
+    if (grid > 9).any():
+        raise ValueError("Invalid grid, only digits are allowed")
+    return grid
+
+
+def grid_shape(path: Path, chunk: int = 2**16) -> tuple[int, int]:
+    # only reads up to the first newline
+    size = path.stat().st_size
+    with open(path, "rb") as f:
+        offset = 0
+        while block := f.read(chunk):
+            if (end := block.find(b"\n")) != -1:
+                width = offset + end
+                return (size + 1) // (width + 1), width
+            offset += len(block)
+    return (1, size) if size else (0, 0)
+
+
+def load_grid(path: Path, shape: tuple[int, int] | None = None) -> np.ndarray:
+    # ascii digits straight from the file, rows are strided over the newlines
+    rows, width = shape or grid_shape(path)
+    raw = np.memmap(path, dtype=np.uint8, mode="r")
+    # a trailing newline is optional. Only the header row is checked up front,
+    # the tiles check their own digits when they are read
+    if raw.size not in (rows * (width + 1), rows * (width + 1) - 1):
+        raise ValueError(f"Invalid grid, rows are not all {width} wide")
+    check_row_ends(raw, width, 0, 1)
+    digits(raw[:width])
+    return np.lib.stride_tricks.as_strided(
+        raw, shape=(rows, width), strides=(width + 1, 1), writeable=False
+    )
+
+
+def check_row_ends(raw: np.ndarray, width: int, lo: int, hi: int):
+    # the newline after each of rows lo..hi, the last row of a file may lack it
+    ends = raw[lo * (width + 1) + width : hi * (width + 1) : width + 1]
+    if (ends != ord("\n")).any():
+        raise ValueError(f"Invalid grid, rows are not all {width} wide")
 
 
 def part_1(s: str) -> int:
-    grid = np.array(parse(s))
-    return visible(grid).sum()
+    grid = parse(s)
+    return int(visible(grid).sum())
+
 
+def visible(grid: np.ndarray) -> np.ndarray:
+    return visible_along(grid, 0) | visible_along(grid, 1)
 
-def visible(grid) -> np.ndarray:
-    mask = np.full_like(grid, False)
-    for _ in range(4):
-        view(grid, mask)
-        grid, mask = map(np.rot90, (grid, mask))
-    return mask
 
+def visible_along(grid: np.ndarray, axis: int) -> np.ndarray:
+    return view(grid, axis) | np.flip(view(np.flip(grid, axis), axis), axis)
 
-def view(grid, visible):
-    for row, mask in zip(grid, visible):
-        highest = -1
-        for i, tree in enumerate(row):
-            if tree > highest:
-                highest = tree
-                mask[i] = True
+
+def view(grid: np.ndarray, axis: int) -> np.ndarray:
+    # a tree is visible if it is taller than the running max of the trees before it
+    highest = np.maximum.accumulate(grid, axis=axis)
+    before = np.full_like(grid, -1, dtype=np.int16)
+    if axis == 0:
+        before[1:] = highest[:-1]
+    else:
+        before[:, 1:] = highest[:, :-1]
+    return grid > before
 
 
 def part_2(s: str) -> int:
-    grid = np.array(parse(s))
-    scores = np.zeros_like(grid, dtype="4int")
-    for row in range(grid.shape[0]):
-        for col in range(grid.shape[1]):
-            scores[row][col] = score(grid, row, col)
-    return np.product(scores, axis=2).max()
-
-
-def score(grid, y, x) -> np.ndarray:
-    house = grid[y][x]
-    col, row = grid[:, x], grid[y]
-    left, right = row[:x][::-1], row[x + 1 :]
-    up, down = col[:y][::-1], col[y + 1 :]
-    return np.array([trees_visible(d, house) for d in (up, left, right, down)])
-
-
-def trees_visible(direction: np.ndarray, house: int) -> int:
-    total = 0  # noqa
-    for tree in direction:
-        total += 1
-        if tree >= house:
-            break
-    return total
+    grid = parse(s)
+    return int(scenic_scores(grid).max())
+
+
+def scenic_scores(grid: np.ndarray) -> np.ndarray:
+    return scenic_along(grid, 0) * scenic_along(grid, 1)
+
+
+def scenic_along(grid: np.ndarray, axis: int, dtype: type = np.int64) -> np.ndarray:
+    if axis == 0:
+        return scenic_along(grid.T, 1, dtype).T
+    forward = viewing_distance(grid).astype(dtype, copy=False)
+    forward *= np.flip(viewing_distance(np.flip(grid, 1)), 1)
+    return forward
+
+
+def viewing_distance(
+    grid: np.ndarray, last: np.ndarray | None = None, offset: int = 0
+) -> np.ndarray:
+    # sweep left to right over all rows at once, remembering for every height the
+    # column of the last tree at least that tall, so a tree sees back to there.
+    # A grid that continues one to its left passes that sweep state in `last`, its
+    # first column being `offset`; `last` is updated in place. Distances are
+    # bounded by the grid size, so int32 is enough
+    rows, cols = grid.shape
+    heights, index = np.arange(10), np.arange(rows)
+    if last is None:
+        last = np.zeros((rows, 10), dtype=np.int32)
+    distance = np.empty((cols, rows), dtype=np.int32)
+    for col, trees in enumerate(np.ascontiguousarray(grid.T), start=offset):
+        distance[col - offset] = col - last[index, trees]
+        np.putmask(last, heights <= trees[:, None], col)
+    return distance.T
+
+
+def score_dtype(shape: tuple[int, int]) -> type:
+    # a score is two distances along each axis, and each pair sums to less than
+    # that side, so it is at most (rows / 2)^2 * (cols / 2)^2
+    rows, cols = shape
+    return np.int32 if ((rows // 2) * (cols // 2)) ** 2 < 2**31 else np.int64
+
+
+def _outputs(out_dir: Path, shape: tuple[int, int], mode: str):
+    open_memmap = np.lib.format.open_memmap
+    mask = open_memmap(out_dir / "visible.npy", mode, dtype=np.bool_, shape=shape)
+    scores = open_memmap(
+        out_dir / "scores.npy", mode, dtype=score_dtype(shape), shape=shape
+    )
+    return mask, scores
+
+
+@dataclass
+class Border:
+    # what the rows of a strip hand to the strips below it, per column: the
+    # tallest tree and, per height, the last row holding a tree at least that tall
+    highest: np.ndarray
+    last: np.ndarray
+
+    @classmethod
+    def of(cls, trees: np.ndarray, lo: int) -> "Border":
+        last = np.full((10, trees.shape[1]), -1, dtype=np.int32)
+        for height in range(10):
+            reached = trees[::-1] >= height
+            row = lo + len(trees) - 1 - np.argmax(reached, axis=0)
+            np.putmask(last[height], reached.any(axis=0), row.astype(np.int32))
+        return cls(trees.max(axis=0).astype(np.int16), last)
+
+    def then(self, below: "Border") -> "Border":
+        return Border(
+            np.maximum(self.highest, below.highest), np.maximum(self.last, below.last)
+        )
+
+
+def _open_tile(path: Path, out_dir: Path, shape: tuple[int, int], lo: int, hi: int):
+    grid = load_grid(path, shape)
+    check_row_ends(np.memmap(path, dtype=np.uint8, mode="r"), shape[1], lo, hi)
+    return digits(grid[lo:hi]), *_outputs(out_dir, shape, "r+")
+
+
+def _row_tile(
+    path: Path, out_dir: Path, shape: tuple[int, int], lo: int, hi: int
+) -> tuple[Border, Border]:
+    # left/right, plus the borders the strips above and below need for up/down.
+    # The bottom border is built on the upside down grid
+    trees, mask, scores = _open_tile(path, out_dir, shape, lo, hi)
+    mask[lo:hi] = visible_along(trees, 1)
+    scores[lo:hi] = scenic_along(trees, 1, scores.dtype)
+    mask.flush()
+    scores.flush()
+    return Border.of(trees, lo), Border.of(trees[::-1], shape[0] - hi)
+
+
+def _sweep_down(
+    trees: np.ndarray, above: Border, lo: int, mask: np.ndarray, scores: np.ndarray
+):
+    # adds what is seen looking up from every tree to the output views
+    highest = np.maximum.accumulate(np.vstack([above.highest, trees]), axis=0)
+    mask |= trees > highest[:-1]
+    scores *= viewing_distance(trees.T, above.last.T.copy(), lo).T
+
+
+def _vertical_tile(
+    path: Path,
+    out_dir: Path,
+    shape: tuple[int, int],
+    lo: int,
+    hi: int,
+    above: Border,
+    below: Border,
+) -> tuple[int, int]:
+    # up/down for a strip of whole rows, continuing the sweeps from its borders
+    # one direction at a time, so only one sweep's temporaries are alive
+    trees, mask, scores = _open_tile(path, out_dir, shape, lo, hi)
+    _sweep_down(trees, above, lo, mask[lo:hi], scores[lo:hi])
+    up = slice(None, None, -1)
+    _sweep_down(trees[up], below, shape[0] - hi, mask[lo:hi][up], scores[lo:hi][up])
+    mask.flush()
+    scores.flush()
+    return int(mask[lo:hi].sum()), int(scores[lo:hi].max())
+
+
+def strip_plan(
+    cols: int, budget: int = MEMORY_BUDGET, workers: int | None = None
+) -> tuple[int, int]:
+    # rows per strip and worker count such that all workers together stay within
+    # the budget, dropping workers rather than going below one row per strip
+    cells = budget // CELL_BYTES
+    cols = max(cols, 1)
+    workers = max(1, min(workers or os.cpu_count() or 1, cells // cols))
+    return max(1, cells // workers // cols), workers
+
+
+def solve_tiled(
+    path: Path,
+    out_dir: Path,
+    budget: int = MEMORY_BUDGET,
+    workers: int | None = None,
+) -> tuple[int, int]:
+    # the file is only ever read as strips of whole rows. The first pass does
+    # left/right and summarises every strip as a border, the second continues the
+    # up/down sweeps from the borders of all strips above and below it. Full
+    # visibility and score matrices are left in out_dir as .npy files. The strip
+    # height and the number of workers follow from the memory budget
+    shape = rows, cols = grid_shape(path)
+    _outputs(out_dir, shape, "w+")
+    tile, workers = strip_plan(cols, budget, workers)
+    tiles = [(lo, min(lo + tile, rows)) for lo in range(0, rows, tile)]
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(_row_tile, path, out_dir, shape, *t) for t in tiles]
+        borders = [future.result() for future in futures]
+
+        edge = Border(
+            np.full(cols, -1, dtype=np.int16), np.zeros((10, cols), dtype=np.int32)
+        )
+        tops, bottoms = zip(*borders)
+        above = list(accumulate(tops[:-1], Border.then, initial=edge))
+        below = list(accumulate(bottoms[:0:-1], Border.then, initial=edge))[::-1]
+        futures = [
+            pool.submit(_vertical_tile, path, out_dir, shape, *t, above[i], below[i])
+            for i, t in enumerate(tiles)
+        ]
+        results = [future.result() for future in futures]
+    return sum(r[0] for r in results), max(r[1] for r in results)
 
 
 if __name__ == "__main__":
@@ -2,7 +2,16 @@ from pathlib import Path
 
 import pytest
 
-from .main import part_1, part_2
+from .main import (
+    CELL_BYTES,
+    grid_shape,
+    load_grid,
+    parse,
+    part_1,
+    part_2,
+    solve_tiled,
+    strip_plan,
+)
 
 TEST_INPUT_FILE = Path(__file__).parent / "test.txt"
 
@@ -18,3 +27,39 @@ def test_part_1(puzzle_input):
 
 def test_part_2(puzzle_input):
     assert part_2(puzzle_input) == 8
+
+
+def test_solve_tiled(tmp_path):
+    budget = 2 * 2 * 5 * CELL_BYTES  # two workers with strips of two rows
+    assert solve_tiled(TEST_INPUT_FILE, tmp_path, budget, workers=2) == (21, 8)
+
+
+def test_strip_plan():
+    budget = 2**20 * CELL_BYTES
+    assert strip_plan(1024, budget, workers=4) == (256, 4)
+    # a budget for fewer strips than workers drops the workers first
+    assert strip_plan(2**19, budget, workers=4) == (1, 2)
+    assert strip_plan(2**21, budget, workers=4) == (1, 1)
+
+
+def test_grid_shape():
+    assert grid_shape(TEST_INPUT_FILE, chunk=2) == (5, 5)
+
+
+@pytest.mark.parametrize("s", ["123\n1234567\n", "123\n45\n", "12\n3x\n"])
+def test_parse_invalid(s, tmp_path):
+    with pytest.raises(ValueError):
+        parse(s)
+    path = tmp_path / "grid.txt"
+    path.write_text(s)
+    with pytest.raises(ValueError):
+        solve_tiled(path, tmp_path, budget=1, workers=1)
+
+
+def test_load_grid_header(tmp_path):
+    path = tmp_path / "grid.txt"
+    path.write_text("1x3\n456\n")
+    with pytest.raises(ValueError):
+        load_grid(path)
+    path.write_text("123\n456")
+    assert load_grid(path).tolist() == [[49, 50, 51], [52, 53, 54]]
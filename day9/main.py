@@ -3,7 +3,7 @@
 import math
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Self
+from typing import Iterable, Self, Sequence
 
 INPUT_FILE = Path(__file__).parent / "input.txt"
 
@@ -69,6 +69,79 @@ def part_2(s: str) -> int:
     return len(visited)
 
 
+class VisitedGrid:
+    # one bit per cell, in square blocks of size by size cells keyed by their
+    # corner; a block is only allocated once the rope enters it, so memory follows
+    # the visited cells rather than their bounding box
+    def __init__(self, size: int = 64):
+        self.shift = max(3, (size - 1).bit_length())  # a power of two, >= 8 cells
+        self.mask = (1 << self.shift) - 1
+        self.blocks: dict[tuple[int, int], bytearray] = {}
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, pos: tuple[int, int]) -> bool:
+        x, y = pos
+        block = self.blocks.get((x >> self.shift, y >> self.shift))
+        if block is None:
+            return False
+        i = (y & self.mask) << self.shift | (x & self.mask)
+        return bool(block[i >> 3] & (1 << (i & 7)))
+
+    def add(self, x: int, y: int):
+        key = (x >> self.shift, y >> self.shift)
+        if (block := self.blocks.get(key)) is None:
+            block = self.blocks[key] = bytearray(1 << (2 * self.shift - 3))
+        i = (y & self.mask) << self.shift | (x & self.mask)
+        bit = 1 << (i & 7)
+        if not block[i >> 3] & bit:
+            block[i >> 3] |= bit
+            self.count += 1
+
+
+STEP = {"L": (-1, 0), "R": (1, 0), "U": (0, 1), "D": (0, -1)}
+
+
+def simulate(s: str, knots: int, track: Sequence[int]) -> list[int]:
+    # knot coordinates live in two flat int lists; a knot that does not move
+    # cannot move any knot behind it, so each step stops at the first resting knot
+    xs, ys = [0] * knots, [0] * knots
+    visited = [VisitedGrid() for _ in track]
+    for grid in visited:
+        grid.add(0, 0)
+    tracked = dict(zip(track, visited))
+    for direction, count in motions(s):
+        step_x, step_y = STEP[direction]
+        for _ in range(count):
+            xs[0] += step_x
+            ys[0] += step_y
+            for i in range(1, knots):
+                dx, dy = xs[i - 1] - xs[i], ys[i - 1] - ys[i]
+                if -FLEX <= dx <= FLEX and -FLEX <= dy <= FLEX:
+                    break
+                xs[i] += (dx > 0) - (dx < 0)
+                ys[i] += (dy > 0) - (dy < 0)
+                if i in tracked:
+                    tracked[i].add(xs[i], ys[i])
+    return [len(v) for v in visited]
+
+
+def solve(s: str) -> tuple[int, int]:
+    # the second knot of a long rope moves exactly like the tail of a short one
+    first, last = simulate(s, 10, track=(1, 9))
+    return first, last
+
+
+def part_1_fast(s: str) -> int:
+    return simulate(s, 2, track=(1,))[0]
+
+
+def part_2_fast(s: str) -> int:
+    return simulate(s, 10, track=(9,))[0]
+
+
 if __name__ == "__main__":
     s = INPUT_FILE.read_text()
     print(f"Part 1: {part_1(s)}")
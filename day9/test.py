@@ -1,6 +1,8 @@
 from pathlib import Path
 
-from .main import part_1, part_2
+import pytest
+
+from .main import VisitedGrid, part_1, part_1_fast, part_2, part_2_fast, simulate, solve
 
 P1_TEST_INPUT_FILE = Path(__file__).parent / "test.txt"
 P2_TEST_INPUT_FILE = Path(__file__).parent / "test_2.txt"
@@ -8,7 +10,38 @@ P2_TEST_INPUT_FILE = Path(__file__).parent / "test_2.txt"
 
 def test_part_1():
     assert part_1(P1_TEST_INPUT_FILE.read_text()) == 13
+    assert part_1_fast(P1_TEST_INPUT_FILE.read_text()) == 13
 
 
 def test_part_2():
     assert part_2(P2_TEST_INPUT_FILE.read_text()) == 36
+    assert part_2_fast(P2_TEST_INPUT_FILE.read_text()) == 36
+
+
+def test_solve():
+    assert solve(P1_TEST_INPUT_FILE.read_text()) == (13, 1)
+    assert simulate(P2_TEST_INPUT_FILE.read_text(), 1000, track=(9, 999)) == [36, 1]
+
+
+@pytest.mark.parametrize("size", [0, 3, 5, 6, 8])
+def test_visited_grid(size):
+    grid = VisitedGrid(size=size)
+    cells = [(0, 0), (-9, 3), (100, -200), (-9, 3), (7, 7), (2, -1)]
+    for x, y in cells:
+        grid.add(x, y)
+    assert len(grid) == 5
+    assert all(cell in grid for cell in cells)
+    assert (1, 1) not in grid
+    assert (10**6, 0) not in grid
+
+
+def test_visited_grid_sparse():
+    # an L shaped path only allocates the blocks along it, not its bounding box
+    grid = VisitedGrid(size=8)
+    for i in range(1000):
+        grid.add(i, 0)
+        grid.add(999, -i)
+    assert len(grid) == 1999
+    # x 0..999 is 125 blocks of 8, y -999..0 is 126, one is shared at the corner
+    assert len(grid.blocks) == 125 + 126 - 1
+    assert (500, -500) not in grid
@@ -0,0 +1,140 @@
+import functools
+import hashlib
+import marshal
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+MAX_MEMORY_BYTES = 256 * 2**20
+MAX_DISK_BYTES = 2**30
+DISK_ENV_VAR = "AOC_PARSE_CACHE"  # directory for the on-disk cache, off if unset
+
+
+class ParseCache:
+    def __init__(
+        self,
+        max_bytes: int = MAX_MEMORY_BYTES,
+        directory: Path | None = None,
+        max_disk_bytes: int = MAX_DISK_BYTES,
+    ):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.entries: OrderedDict[str, bytes] = OrderedDict()
+        self.size = 0
+        if directory:
+            directory.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key: str) -> bytes | None:
+        if (blob := self.entries.get(key)) is not None:
+            self.entries.move_to_end(key)
+            return blob
+        if self.directory:
+            path = self._path(key)
+            try:
+                blob = path.read_bytes()
+                path.touch()  # mtime doubles as lru timestamp
+            except OSError:  # missing, or evicted by another process meanwhile
+                return None
+            self._remember(key, blob)
+            return blob
+        return None
+
+    def put(self, key: str, blob: bytes):
+        self._remember(key, blob)
+        if self.directory:
+            # other processes may read the same entry, so it only ever appears whole
+            with tempfile.NamedTemporaryFile(
+                dir=self.directory, suffix=".tmp", delete=False
+            ) as tmp:
+                tmp.write(blob)
+            os.replace(tmp.name, self._path(key))
+            self._evict_disk()
+
+    def discard(self, key: str):
+        if (old := self.entries.pop(key, None)) is not None:
+            self.size -= len(old)
+        if self.directory:
+            self._path(key).unlink(missing_ok=True)
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+        if self.directory:
+            for path in self.directory.glob("*.pickle"):
+                path.unlink(missing_ok=True)
+
+    def _remember(self, key: str, blob: bytes):
+        if len(blob) > self.max_bytes:
+            return
+        if (old := self.entries.pop(key, None)) is not None:
+            self.size -= len(old)
+        self.entries[key] = blob
+        self.size += len(blob)
+        while self.size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.pickle"
+
+    def _evict_disk(self):
+        files = []
+        for path in self.directory.glob("*.pickle"):
+            try:
+                files.append((path.stat(), path))
+            except FileNotFoundError:
+                continue
+        total = sum(stat.st_size for stat, _ in files)
+        for stat, path in sorted(files, key=lambda f: f[0].st_mtime):
+            if total <= self.max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+
+
+_disk_dir = os.environ.get(DISK_ENV_VAR)
+cache = ParseCache(directory=Path(_disk_dir) if _disk_dir else None)
+
+
+def _source_hash(func: Callable) -> str:
+    code = func.__code__
+    try:
+        source = Path(code.co_filename).read_bytes()
+    except OSError:
+        source = marshal.dumps(code)
+    return hashlib.sha256(source).hexdigest()[:12]
+
+
+def cached_parse(func: Callable[..., T]) -> Callable[..., T]:
+    # the input text is always the last positional argument, so this also works
+    # below @classmethod. Results are stored pickled: every hit gets a fresh copy
+    # that the caller is free to mutate.
+    # the source hash makes entries from an older version of the parser misses
+    name = f"{func.__module__}.{func.__qualname__}-{_source_hash(func)}"
+
+    @functools.wraps(func)
+    def wrapper(*args) -> T:
+        digest = hashlib.sha256(args[-1].encode()).hexdigest()
+        key = f"{name}-{digest}"
+        if (blob := cache.get(key)) is not None:
+            try:
+                return pickle.loads(blob)
+            except (pickle.UnpicklingError, EOFError, ValueError):
+                cache.discard(key)
+
+        result = func(*args)
+        try:
+            blob = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, AttributeError, TypeError, RecursionError):
+            # e.g. lambdas, or deep trees with parent links
+            return result
+        cache.put(key, blob)
+        return result
+
+    return wrapper
@@ -0,0 +1,127 @@
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection, wait
+from pathlib import Path
+
+from bench import day_modules, input_file, parts
+
+DEFAULT_TIMEOUT_SEC = 60
+
+
+@dataclass
+class Result:
+    day: int
+    part: str
+    status: str  # ok | error | timeout | crashed
+    answer: str | None
+    seconds: float
+
+
+def solve(day: int, part: str, test: bool, conn: Connection):
+    module = importlib.import_module(f"day{day}.main")
+    s = input_file(module, test).read_text()
+    start = time.perf_counter()
+    try:
+        answer = getattr(module, part)(s)
+    except Exception as e:
+        conn.send(("error", repr(e), time.perf_counter() - start))
+    else:
+        conn.send(("ok", str(answer), time.perf_counter() - start))
+    conn.close()
+
+
+def collect_jobs(
+    days: list[int], test: bool, variants: bool
+) -> tuple[list[tuple[int, str]], list[Result]]:
+    jobs, failed = [], []
+    for day, module in day_modules(days):
+        if isinstance(module, Exception):
+            failed.append(Result(day, "import", "error", repr(module), 0.0))
+            continue
+        if not input_file(module, test).exists():
+            print(f"day{day}: no input, skipping", file=sys.stderr)
+            continue
+        for name, _ in parts(module):
+            if variants or name in ("part_1", "part_2"):
+                jobs.append((day, name))
+    return jobs, failed
+
+
+def run_all(
+    jobs: list[tuple[int, str]], test: bool, timeout: float, workers: int
+) -> list[Result]:
+    pending = deque(jobs)
+    running: dict[Connection, tuple[Process, int, str, float]] = {}
+    results = []
+
+    while pending or running:
+        while pending and len(running) < workers:
+            day, part = pending.popleft()
+            recv, send = Pipe(duplex=False)
+            proc = Process(target=solve, args=(day, part, test, send), daemon=True)
+            proc.start()
+            send.close()
+            running[recv] = (proc, day, part, time.perf_counter())
+
+        now = time.perf_counter()
+        next_deadline = min(started + timeout for *_, started in running.values())
+        for conn in wait(list(running), timeout=max(next_deadline - now, 0)):
+            proc, day, part, started = running.pop(conn)
+            try:
+                status, answer, seconds = conn.recv()
+            except EOFError:
+                status, answer, seconds = "crashed", None, time.perf_counter() - started
+            proc.join()
+            results.append(Result(day, part, status, answer, seconds))
+
+        now = time.perf_counter()
+        for conn, (proc, day, part, started) in list(running.items()):
+            if now - started >= timeout:
+                proc.terminate()
+                proc.join()
+                del running[conn]
+                results.append(Result(day, part, "timeout", None, now - started))
+
+    return sorted(results, key=lambda r: (r.day, r.part))
+
+
+def report(results: list[Result], wall: float):
+    for r in results:
+        answer = (r.answer or "").replace("\n", "\\n")
+        if r.status != "ok":
+            answer = f"{r.status.upper()} {answer}".rstrip()
+        print(f"day{r.day:<3} {r.part:<24} {r.seconds:>9.3f}s  {answer}")
+    total = sum(r.seconds for r in results)
+    print(f"\nWall time {wall:.3f}s, sum of parts {total:.3f}s")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run every dayN part in parallel")
+    parser.add_argument("days", nargs="*", type=int, help="days to run, all if empty")
+    parser.add_argument("-t", "--test", action="store_true", help="use test.txt")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_SEC)
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--variants", action="store_true", help="run part_N_* too")
+    parser.add_argument("-o", "--output", type=Path, help="write results as JSON")
+    args = parser.parse_args()
+
+    jobs, failed = collect_jobs(args.days, args.test, args.variants)
+    start = time.perf_counter()
+    results = run_all(jobs, args.test, args.timeout, args.workers)
+    results = sorted(failed + results, key=lambda r: (r.day, r.part))
+    report(results, time.perf_counter() - start)
+
+    if args.output:
+        args.output.write_text(json.dumps([asdict(r) for r in results], indent=4))
+    return 0 if all(r.status == "ok" for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())